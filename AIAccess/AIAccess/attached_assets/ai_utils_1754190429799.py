@@ -1,7 +1,18 @@
+import json
 import requests
 import os
+import threading
 
-def ask_openrouter(conversation_history, model="meta-llama/llama-4-maverick"):
+# requests.Session isn't guaranteed thread-safe, so each worker thread
+# keeps its own and reuses its warm connections across calls
+local = threading.local()
+
+def get_session():
+    if not hasattr(local, "session"):
+        local.session = requests.Session()
+    return local.session
+
+def ask_openrouter(conversation_history, model="meta-llama/llama-4-maverick", on_chunk=None):
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
     if not OPENROUTER_API_KEY:
         return "OpenRouter API key missing."
@@ -15,13 +26,37 @@ def ask_openrouter(conversation_history, model="meta-llama/llama-4-maverick"):
         "model": model,
         "messages": conversation_history,  # list of {"role": "...", "content": "..."}
         "max_tokens": 300,
-        "temperature": 0.7
+        "temperature": 0.7,
+        "stream": on_chunk is not None
     }
 
+    parts = []
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        with get_session().post(url, headers=headers, json=data, stream=on_chunk is not None) as response:
+            response.raise_for_status()
+            if on_chunk is not None:
+                return read_stream(response, on_chunk, parts)
+            result = response.json()
+            return result["choices"][0]["message"]["content"]
     except Exception as e:
-        return f"Error querying OpenRouter: {e}"
+        # Keep any text already streamed so what was shown matches what is returned
+        separator = "\n" if parts else ""
+        error = f"Error querying OpenRouter: {e}"
+        if on_chunk is not None:
+            on_chunk(separator + error)
+        return "".join(parts) + separator + error
+
+def read_stream(response, on_chunk, parts):
+    # Server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data: "):
+            continue
+        payload = line[len("data: "):]
+        if payload == "[DONE]":
+            break
+        text = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+        if text:
+            parts.append(text)
+            on_chunk(text)
+    return "".join(parts)
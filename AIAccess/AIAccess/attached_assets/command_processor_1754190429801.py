@@ -60,7 +60,7 @@ def search_web(query):
     except Exception:
         return None
 
-def processCommand(command, wolf_client, conversation_history):
+def processCommand(command, wolf_client, conversation_history, on_chunk=None):
     c = command.lower().strip()
     memory = get_memory()
 
@@ -183,7 +183,7 @@ def processCommand(command, wolf_client, conversation_history):
             if not response:
                 model = "deepseek/deepseek-chat-v3-0324" if "code" in c or "calculate" in c else "meta-llama/llama-4-maverick"
                 conversation_history.append({"role": "user", "content": command})
-                response = ask_openrouter(conversation_history, model)
+                response = ask_openrouter(conversation_history, model, on_chunk)
                 conversation_history.append({"role": "assistant", "content": response})
 
     elif match_keywords(c, ["write", "compose", "draft", "letter"]):
@@ -192,7 +192,7 @@ def processCommand(command, wolf_client, conversation_history):
     else:
         model = "deepseek/deepseek-chat-v3-0324" if "code" in c or "calculate" in c else "meta-llama/llama-4-maverick"
         conversation_history.append({"role": "user", "content": command})
-        response = ask_openrouter(conversation_history, model)
+        response = ask_openrouter(conversation_history, model, on_chunk)
         conversation_history.append({"role": "assistant", "content": response})
 
     if not match_keywords(c, DYNAMIC_COMMANDS) and "sorry" not in str(response).lower():
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+import time
+from jarvis_client import DAEMON_HOST, DAEMON_PORT, check_hello, encode_message, hello_request
+
+# Typical runs against a daemon that is already up:
+#   python daemon_load_test.py
+#       "tell me a joke" is never cached, so every request goes through
+#       processCommand's language detection and keyword routing.
+#   python daemon_load_test.py --command "how are you"
+#       Answered from memory.json: measures the daemon's own overhead.
+#   python daemon_load_test.py --command "what is the speed of light" --unique --clients 4 --requests 5
+#       Each request misses memory and goes out to web search / Wolfram /
+#       OpenRouter. This spends API credit and adds the answers to memory.json.
+
+
+async def run_client(client_id, args, latencies, errors):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        writer.write(encode_message(hello_request(args.port)))
+        await writer.drain()
+        check_hello(json.loads(await reader.readline() or "null"))
+        for request_id in range(1, args.requests + 1):
+            command = args.command
+            if args.unique:
+                command = f"{command} {client_id}-{request_id}"
+            # No session name: the daemon drops a connection's own session when it closes
+            request = {"id": request_id, "command": command}
+            start = time.perf_counter()
+            writer.write(encode_message(request))
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("Jarvis daemon closed the connection.")
+                message = json.loads(line)
+                if message["type"] == "done":
+                    latencies.append(time.perf_counter() - start)
+                    break
+                if message["type"] == "error":
+                    errors.append(message["error"])
+                    break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Multi-client load test for jarvis_daemon.")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--command", default="tell me a joke",
+                        help="command to send; the default is never cached, so it runs the full local pipeline")
+    parser.add_argument("--unique", action="store_true",
+                        help="make every command distinct so none is answered from memory.json "
+                             "(calls external services and adds entries to memory.json)")
+    parser.add_argument("--host", default=DAEMON_HOST)
+    parser.add_argument("--port", type=int, default=DAEMON_PORT)
+    args = parser.parse_args()
+
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(i, args, latencies, errors) for i in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Command: {args.command!r}{' (unique per request)' if args.unique else ''}")
+    print(f"Clients: {args.clients}, requests: {len(latencies) + len(errors)}, errors: {len(errors)}")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} req/s over {elapsed:.2f}s")
+    for pct in (50, 90, 99, 99.9):
+        print(f"p{pct}: {percentile(latencies, pct) * 1000:.2f} ms")
+    if latencies:
+        print(f"max: {latencies[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
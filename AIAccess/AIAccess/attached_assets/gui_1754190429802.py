@@ -1,25 +1,32 @@
 import sys
 import threading
+import itertools
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QTextEdit, QLineEdit, QPushButton, QLabel, QMessageBox
 )
-from PyQt5.QtGui import QPalette, QColor, QFont, QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPalette, QColor, QFont, QPixmap, QTextCursor, QTextCharFormat
+from PyQt5.QtCore import Qt, pyqtSignal
 from speech_utils import recognize_speech, speak
-from command_processor import processCommand
-from memory_utils import load_memory, save_memory
-import os
-import wolframalpha
+from jarvis_client import JarvisClient
 from dotenv import load_dotenv
 from googlesearch import search
 import requests
 from bs4 import BeautifulSoup
 
 class JarvisGUI(QWidget):
+    # Worker threads must not touch widgets; they emit these and Qt runs
+    # the connected slots on the GUI thread, in order
+    status_changed = pyqtSignal(str)
+    message_posted = pyqtSignal(str, str)
+    reply_chunk = pyqtSignal(int, str)
+    reply_finished = pyqtSignal(int, str)
+
     def __init__(self):
         super().__init__()
         self.latest_response = ""  # Store last response
+        self.reply_ids = itertools.count(1)
+        self.replies = {}  # reply id -> (cursor at start of its text, text length)
 
         self.setWindowTitle("Jarvis Assistant")
         self.setGeometry(200, 200, 700, 600)
@@ -93,15 +100,18 @@ class JarvisGUI(QWidget):
         self.layout.addWidget(self.status_label)
         self.setLayout(self.layout)
 
-        self.conversation_history = []
-        load_memory()
+        self.status_changed.connect(self.status_label.setText)
+        self.message_posted.connect(self.display_message)
+        self.reply_chunk.connect(self.append_chunk)
+        self.reply_finished.connect(self.finish_reply)
 
         load_dotenv()
-        wolfram_app_id = os.getenv("WOLFRAM_APP_ID")
-        if not wolfram_app_id:
-            QMessageBox.critical(self, "Error", "Missing WolframAlpha App ID in .env")
+        self.client = JarvisClient(session="gui")
+        try:
+            self.client.connect()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not start Jarvis: {e}")
             sys.exit()
-        self.wolf_client = wolframalpha.Client(wolfram_app_id)
 
     def fetch_web_result(self, query):
         try:
@@ -137,22 +147,24 @@ class JarvisGUI(QWidget):
     def recognize_and_process(self):
         command = recognize_speech()
         if command:
-            self.display_message("You (voice)", command)
+            self.message_posted.emit("You (voice)", command)
             self.process_command(command)
         else:
-            self.status_label.setText("Sorry, I didn't catch that.")
+            self.status_changed.emit("Sorry, I didn't catch that.")
 
     def process_command(self, command):
-        self.status_label.setText("Processing...")
-        response = processCommand(command, self.wolf_client, self.conversation_history)
+        # Runs on a worker thread
+        self.status_changed.emit("Processing...")
+        reply_id = next(self.reply_ids)
+        try:
+            response = self.client.process_command(
+                command, on_chunk=lambda text: self.reply_chunk.emit(reply_id, text)
+            )
+        except Exception as e:
+            response = f"Jarvis daemon error: {e}"
         if not response or "sorry" in response.lower():
             response = self.fetch_web_result(command)
-
-        self.conversation_history.append({"role": "user", "content": command})
-        self.conversation_history.append({"role": "assistant", "content": response})
-        self.display_message("Jarvis", response)
-        self.latest_response = response
-        self.status_label.setText("Ready")
+        self.reply_finished.emit(reply_id, response)
 
     def speak_latest_output(self):
         if self.latest_response:
@@ -161,9 +173,39 @@ class JarvisGUI(QWidget):
     def close_jarvis(self):
         self.status_label.setText("Jarvis is shutting down...")
         speak("Shutting down now")
-        save_memory()
+        self.client.close()
         QApplication.quit()
 
+    def open_reply(self, reply_id):
+        self.display_message("Jarvis", "")
+        start = QTextCursor(self.chat_display.document())
+        start.movePosition(QTextCursor.End)
+        # Stays in front of this reply's text as it grows, while messages
+        # appended later (and other replies above it) move it as needed
+        start.setKeepPositionOnInsert(True)
+        self.replies[reply_id] = (start, 0)
+
+    def append_chunk(self, reply_id, text):
+        if reply_id not in self.replies:
+            self.open_reply(reply_id)
+        start, length = self.replies[reply_id]
+        cursor = QTextCursor(self.chat_display.document())
+        cursor.setPosition(start.position() + length)
+        cursor.insertText(text, QTextCharFormat())
+        self.replies[reply_id] = (start, cursor.position() - start.position())
+
+    def finish_reply(self, reply_id, response):
+        if reply_id not in self.replies:
+            self.open_reply(reply_id)
+        start, length = self.replies.pop(reply_id)
+        # Replace what was streamed with the final reply (e.g. the web fallback)
+        cursor = QTextCursor(self.chat_display.document())
+        cursor.setPosition(start.position())
+        cursor.setPosition(start.position() + length, QTextCursor.KeepAnchor)
+        cursor.insertText(response, QTextCharFormat())
+        self.latest_response = response
+        self.status_label.setText("Ready")
+
     def display_message(self, sender, message):
         self.chat_display.append(f"<b>{sender}:</b> {message}")
 
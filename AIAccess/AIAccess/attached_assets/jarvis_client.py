@@ -0,0 +1,171 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+DAEMON_HOST = os.getenv("JARVIS_DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("JARVIS_DAEMON_PORT", "8765"))
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jarvis_daemon.py")
+DAEMON_DIR = os.getenv("JARVIS_DAEMON_DIR", os.path.expanduser("~"))
+STARTUP_TIMEOUT = 30
+# Longest wait for the next message of a reply (OpenRouter, web search and Wolfram can be slow)
+REPLY_TIMEOUT = int(os.getenv("JARVIS_CLIENT_TIMEOUT", "120"))
+LOG_LINES = 5
+
+
+def token_file(port):
+    return os.path.join(DAEMON_DIR, f".jarvis_daemon_{port}.token")
+
+
+def log_file(port):
+    return os.path.join(DAEMON_DIR, f".jarvis_daemon_{port}.log")
+
+
+def read_token(port):
+    with open(token_file(port), "r") as f:
+        return f.read().strip()
+
+
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def hello_request(port):
+    return {"type": "hello", "token": read_token(port)}
+
+
+def check_hello(reply):
+    if not isinstance(reply, dict) or reply.get("type") != "hello":
+        raise PermissionError("Jarvis daemon rejected the session token.")
+
+
+class JarvisClient:
+    """Thin client for jarvis_daemon; starts the daemon if none is running."""
+
+    def __init__(self, session=None, host=DAEMON_HOST, port=DAEMON_PORT, autostart=True):
+        self.session = session
+        self.host = host
+        self.port = port
+        self.autostart = autostart
+        self.sock = None
+        self.reader = None
+        self.request_ids = 0
+        self.start_error = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        try:
+            self.sock = socket.create_connection((self.host, self.port))
+        except OSError:
+            if not self.autostart:
+                raise
+            # Don't spawn (and wait) again for every command after a failed start
+            if self.start_error:
+                raise RuntimeError(self.start_error)
+            try:
+                self.sock = self.start_daemon()
+            except RuntimeError as e:
+                self.start_error = str(e)
+                raise
+        self.sock.settimeout(REPLY_TIMEOUT)
+        self.reader = self.sock.makefile("r", encoding="utf-8")
+        try:
+            self.send(hello_request(self.port))
+            check_hello(json.loads(self.reader.readline() or "null"))
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def start_daemon(self):
+        # The daemon is shared by every front end, so it must not live in this
+        # client's console or process group (Ctrl+C here would kill it for all)
+        if os.name == "nt":
+            options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        env = dict(os.environ, JARVIS_DAEMON_HOST=self.host, JARVIS_DAEMON_PORT=str(self.port))
+        with open(log_file(self.port), "w") as log:
+            proc = subprocess.Popen(
+                [sys.executable, DAEMON_SCRIPT],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, env=env, **options
+            )
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                return socket.create_connection((self.host, self.port))
+            except OSError:
+                pass
+            if proc.poll() is not None:
+                # Another front end may have started the daemon at the same time
+                try:
+                    return socket.create_connection((self.host, self.port))
+                except OSError:
+                    raise RuntimeError(f"Jarvis daemon exited with code {proc.returncode}: {self.read_log()}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Jarvis daemon did not start within {STARTUP_TIMEOUT}s: {self.read_log()}")
+            time.sleep(0.2)
+
+    def read_log(self):
+        try:
+            with open(log_file(self.port), "r") as f:
+                lines = f.read().strip().splitlines()
+        except OSError:
+            return "no log available."
+        return " ".join(lines[-LOG_LINES:]) or "no output."
+
+    def send(self, message):
+        self.sock.sendall(encode_message(message))
+
+    def close(self):
+        if self.sock:
+            self.reader.close()
+            self.sock.close()
+            self.sock = None
+            self.reader = None
+
+    def process_command(self, command, on_chunk=None):
+        with self.lock:
+            if self.sock is None:
+                self.connect()
+            self.request_ids += 1
+            request = {"id": self.request_ids, "command": command}
+            if self.session:
+                request["session"] = self.session
+            try:
+                self.send(request)
+                return self.read_reply(self.request_ids, on_chunk)
+            except (OSError, ConnectionError):
+                self.close()
+                raise
+
+    def shutdown_daemon(self):
+        # Returns once the daemon has finished its running commands and hung up
+        with self.lock:
+            if self.sock is None:
+                self.connect()
+            try:
+                self.send({"type": "shutdown"})
+                while self.reader.readline():
+                    pass
+            finally:
+                self.close()
+
+    def read_reply(self, request_id, on_chunk):
+        chunks = []
+        for line in self.reader:
+            message = json.loads(line)
+            if message.get("id") != request_id:
+                continue
+            if message["type"] == "chunk":
+                chunks.append(message["text"])
+                if on_chunk:
+                    on_chunk(message["text"])
+            elif message["type"] == "done":
+                return message.get("text", "".join(chunks))
+            elif message["type"] == "error":
+                raise RuntimeError(message["error"])
+        raise ConnectionError("Jarvis daemon closed the connection.")
@@ -0,0 +1,282 @@
+import asyncio
+import hmac
+import itertools
+import json
+import os
+import secrets
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from dotenv import load_dotenv
+import wolframalpha
+from command_processor import processCommand
+from memory_utils import load_memory, save_memory
+from app_launcher import load_apps
+from jarvis_client import DAEMON_HOST, DAEMON_PORT, JarvisClient, encode_message, token_file
+
+# One daemon hosts processCommand for every front end (jarvismain, gui, jarvis_gui).
+# Protocol: newline-delimited JSON over a local TCP socket.
+#   client -> {"type": "hello", "token": "..."}  (first line, token from token_file)
+#   server -> {"type": "hello"}  or an error and the connection is closed
+#   client -> {"id": 1, "command": "open youtube", "session": "gui"}
+#   server -> {"id": 1, "type": "chunk", "text": "..."}  (streamed as OpenRouter replies,
+#             otherwise a single chunk with the whole reply)
+#             {"id": 1, "type": "done", "text": full reply}  or  {"id": 1, "type": "error", "error": "..."}
+#   client -> {"type": "shutdown"}  finishes running commands, saves memory and exits
+MAX_WORKERS = int(os.getenv("JARVIS_DAEMON_WORKERS", "8"))
+MAX_SESSIONS = int(os.getenv("JARVIS_DAEMON_MAX_SESSIONS", "32"))
+SESSION_TTL = int(os.getenv("JARVIS_DAEMON_SESSION_TTL", "3600"))
+
+
+class Session:
+    def __init__(self):
+        self.conversation_history = []
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+def write_token(path):
+    # Only the current user may read the token; it gates every command
+    token = secrets.token_hex(32)
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(tmp_path, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+    return token
+
+
+class JarvisDaemon:
+    def __init__(self, wolf_client, max_workers=MAX_WORKERS):
+        self.wolf_client = wolf_client
+        self.token = None
+        self.stopping = asyncio.Event()
+        self.connections = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.sessions = {}
+        self.connection_ids = itertools.count(1)
+
+    def get_session(self, name):
+        self.prune_sessions(keep=name)
+        if name not in self.sessions:
+            self.sessions[name] = Session()
+        session = self.sessions[name]
+        session.last_used = time.monotonic()
+        return session
+
+    def prune_sessions(self, keep):
+        # Drop idle sessions past SESSION_TTL, then the least recently used
+        # ones until a new session fits under MAX_SESSIONS
+        now = time.monotonic()
+        idle = sorted(
+            (session.last_used, name) for name, session in self.sessions.items()
+            if name != keep and not session.lock.locked()
+        )
+        excess = len(self.sessions) - MAX_SESSIONS + (keep not in self.sessions)
+        for last_used, name in idle:
+            if now - last_used > SESSION_TTL or excess > 0:
+                del self.sessions[name]
+                excess -= 1
+
+    async def run_command(self, command, session, on_chunk=None):
+        # Commands in one session run in order so its history stays consistent;
+        # different sessions run side by side on the thread pool.
+        # The lock is released when the worker finishes, not when this task
+        # ends, so a disconnect can't let the next command overlap a running one.
+        loop = asyncio.get_running_loop()
+        await session.lock.acquire()
+        try:
+            future = loop.run_in_executor(
+                self.executor, processCommand, command, self.wolf_client, session.conversation_history, on_chunk
+            )
+        except BaseException:
+            session.lock.release()
+            raise
+        future.add_done_callback(lambda _: session.lock.release())
+        return await asyncio.shield(future)
+
+    async def send(self, writer, message):
+        if writer.is_closing():
+            return
+        try:
+            writer.write(encode_message(message))
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def read_request(self, reader, writer):
+        """Return the next request, or None if the connection should be closed."""
+        try:
+            line = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            await self.send(writer, {"id": None, "type": "error", "error": "Request too long."})
+            return None
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            # Not our protocol (e.g. a browser POSTing to the port), so stop reading
+            await self.send(writer, {"id": None, "type": "error", "error": "Invalid JSON."})
+            return None
+
+    async def authenticate(self, reader, writer):
+        hello = await self.read_request(reader, writer)
+        if hello is None:
+            return False
+        if (not isinstance(hello, dict) or hello.get("type") != "hello"
+                or not hmac.compare_digest(str(hello.get("token", "")), self.token)):
+            await self.send(writer, {"id": None, "type": "error", "error": "Authentication failed."})
+            return False
+        await self.send(writer, {"type": "hello"})
+        return True
+
+    async def handle_request(self, request, default_session, writer):
+        # Every request must end in exactly one "done" or "error" message,
+        # otherwise the client waits on it until its timeout
+        request_id = request.get("id")
+        task = None
+        try:
+            command = request.get("command")
+            session_name = request.get("session") or default_session
+            if not isinstance(command, str) or not command.strip():
+                raise ValueError("Command must be a non-empty string.")
+            if not isinstance(session_name, str):
+                raise ValueError("Session must be a string.")
+
+            session = self.get_session(session_name)
+            loop = asyncio.get_running_loop()
+            chunks = asyncio.Queue()
+
+            def on_chunk(text):
+                # Called from the worker thread while the reply is still being generated
+                loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+            task = asyncio.ensure_future(self.run_command(command.strip(), session, on_chunk))
+            # Queued after any chunks, since the worker's result reaches the loop last
+            task.add_done_callback(lambda _: chunks.put_nowait(None))
+            streamed = False
+            while True:
+                text = await chunks.get()
+                if text is None:
+                    break
+                streamed = True
+                await self.send(writer, {"id": request_id, "type": "chunk", "text": text})
+            response = task.result()
+        except asyncio.CancelledError:
+            if task:
+                task.cancel()
+            raise
+        except Exception as e:
+            await self.send(writer, {"id": request_id, "type": "error", "error": str(e)})
+            return
+
+        response = "" if response is None else str(response)
+        if not streamed and response:
+            await self.send(writer, {"id": request_id, "type": "chunk", "text": response})
+        await self.send(writer, {"id": request_id, "type": "done", "text": response})
+
+    async def handle_client(self, reader, writer):
+        default_session = f"connection-{next(self.connection_ids)}"
+        self.connections[writer] = asyncio.current_task()
+        tasks = set()
+        try:
+            if not await self.authenticate(reader, writer):
+                return
+            while True:
+                request = await self.read_request(reader, writer)
+                if request is None:
+                    break
+                if not isinstance(request, dict):
+                    await self.send(writer, {"id": None, "type": "error", "error": "Request must be a JSON object."})
+                    continue
+
+                if request.get("type") == "ping":
+                    await self.send(writer, {"id": request.get("id"), "type": "pong"})
+                    continue
+
+                if request.get("type") == "shutdown":
+                    await self.send(writer, {"id": request.get("id"), "type": "shutdown"})
+                    self.stopping.set()
+                    continue
+
+                task = asyncio.create_task(self.handle_request(request, default_session, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self.connections.pop(writer, None)
+            # The connection's own session is not reachable again once it closes
+            self.sessions.pop(default_session, None)
+
+    async def serve(self, host=DAEMON_HOST, port=DAEMON_PORT):
+        # Bind first so a second daemon fails before overwriting the token,
+        # and only start listening once the token is on disk
+        server = await asyncio.start_server(self.handle_client, host, port, start_serving=False)
+        self.token = write_token(token_file(port))
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stopping.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows: use the shutdown request ("jarvis_daemon.py stop") instead
+                pass
+
+        print(f"Jarvis daemon listening on {host}:{port}")
+        await server.start_serving()
+        try:
+            await self.stopping.wait()
+            # Finish running commands and save memory before the port is
+            # released, so a restarted daemon never overlaps this one
+            print("Jarvis daemon shutting down...")
+            await loop.run_in_executor(None, self.shutdown)
+            # Hang up on clients so their handlers end on EOF rather than
+            # being cancelled by asyncio.run
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*self.connections.values(), return_exceptions=True)
+        finally:
+            # Not wait_closed(): connected front ends would keep it waiting
+            server.close()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        save_memory()
+
+
+def main():
+    if sys.argv[1:] == ["stop"]:
+        try:
+            JarvisClient(autostart=False).shutdown_daemon()
+            print("Jarvis daemon stopped.")
+        except ConnectionError:
+            print("Jarvis daemon is not running.")
+        return
+
+    # memory.json, apps.json and screenshots are relative paths; resolve them
+    # against the assistant's folder, not whichever front end started us
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv()
+    wolfram_app_id = os.getenv("WOLFRAM_APP_ID")
+    if not wolfram_app_id:
+        # Non-zero exit so a client that started the daemon reports the reason
+        sys.exit("Missing WolframAlpha App ID. Please set it in the .env file.")
+
+    load_memory()
+    load_apps()
+    daemon = JarvisDaemon(wolframalpha.Client(wolfram_app_id))
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        daemon.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,14 @@ from tkinter import ttk
 import math
 import time
 import threading
-from command_processor import processCommand
+from jarvis_client import JarvisClient
 from dotenv import load_dotenv
-import os
-import wolframalpha
 
 # Load environment variables
 load_dotenv()
-WOLFRAM_APP_ID = os.getenv("WOLFRAM_APP_ID")
-wolf_client = wolframalpha.Client(WOLFRAM_APP_ID)
 
-# Global conversation history
-conversation_history = []
+# Commands and conversation history are handled by the shared Jarvis daemon
+client = JarvisClient(session="jarvis_gui")
 
 # Setup the GUI
 root = tk.Tk()
@@ -66,6 +62,18 @@ command_entry.pack(pady=10)
 output_text = tk.Text(root, width=65, height=15, font=("Arial", 12), bg="black", fg="#00ffff", wrap="word")
 output_text.pack(padx=10, pady=10)
 
+# Connect (starting the daemon if needed) once, before the first command
+try:
+    client.connect()
+except Exception as e:
+    output_text.insert(tk.END, f"Error: Could not start Jarvis: {e}\n\n")
+
+# Show the reply as it streams in; the window isn't in mainloop while a command runs
+def show_chunk(text):
+    output_text.insert(tk.END, text)
+    output_text.see(tk.END)
+    output_text.update_idletasks()
+
 # Run Jarvis command on button click
 def run_command():
     user_input = command_entry.get()
@@ -75,10 +83,10 @@ def run_command():
     output_text.see(tk.END)
 
     # Process command
-    global conversation_history
     try:
-        response = processCommand(user_input, wolf_client, conversation_history)
-        output_text.insert(tk.END, f"Jarvis: {response}\n\n")
+        output_text.insert(tk.END, "Jarvis: ")
+        client.process_command(user_input, on_chunk=show_chunk)
+        output_text.insert(tk.END, "\n\n")
         output_text.see(tk.END)
     except Exception as e:
         output_text.insert(tk.END, f"Error: {str(e)}\n\n")
@@ -1,29 +1,24 @@
 import os
 from speech_utils import speak, recognize_speech
-from memory_utils import load_memory, save_memory
-from command_processor import processCommand
-from app_launcher import load_apps, launch_app
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
-import wolframalpha
-
-conversation_history = []
+from jarvis_client import JarvisClient
 
 
 
 def main():
     load_dotenv()
-    wolfram_app_id = os.getenv("WOLFRAM_APP_ID")
-    if not wolfram_app_id:
-        speak("Missing WolframAlpha App ID. Please set it in the .env file.")
+    # Wolfram client, memory, apps and history all live in the shared daemon
+    client = JarvisClient(session="jarvismain")
+    try:
+        client.connect()
+    except Exception as e:
+        print(f"Could not start Jarvis: {e}")
+        speak(f"Could not start Jarvis. {e}")
         return
 
-    wolf_client = wolframalpha.Client(wolfram_app_id)
-
-    load_memory()
-    load_apps()
     print("Hello, I am Jarvis Alpha variant. How can I assist you?")
     speak("Hello, I am Jarvis Alpha variant. How can I assist you?")
 
@@ -38,13 +33,13 @@ def main():
                 speak("Jarvis alpha0variant initialising to shutdown ")
                 break
 
-            # Add user input to conversation history
-            conversation_history.append({"role": "user", "content": command})
-
-            response = processCommand(command, wolf_client, conversation_history)
-            conversation_history.append({"role": "assistant", "content": response})
-
-            print("jarvis:",response)
+            print("jarvis: ", end="", flush=True)
+            try:
+                response = client.process_command(command, on_chunk=lambda text: print(text, end="", flush=True))
+            except Exception as e:
+                response = f"Jarvis daemon error: {e}"
+                print(response, end="")
+            print()
             speak(response)
 
         
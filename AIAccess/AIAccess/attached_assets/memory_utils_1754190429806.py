@@ -1,8 +1,10 @@
 import json
 import os
+import threading
 
 MEMORY_FILE = "memory.json"
 memory = {}
+memory_lock = threading.Lock()
 
 def load_memory():
     global memory
@@ -19,7 +21,7 @@ def load_memory():
 
 def save_memory():
     try:
-        with open(MEMORY_FILE, "w") as f:
+        with memory_lock, open(MEMORY_FILE, "w") as f:
             json.dump(memory, f, indent=4)
         print("Memory saved.")
     except Exception as e:
@@ -29,5 +31,6 @@ def get_memory():
     return memory
 
 def update_memory(key, value):
-    memory[key] = value
+    with memory_lock:
+        memory[key] = value
     save_memory()